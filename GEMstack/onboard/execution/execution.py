@@ -1,5 +1,5 @@
 from __future__ import annotations
-from dataclasses import asdict
+from dataclasses import fields
 from ...state import AllState, MissionEnum
 from ..component import Component
 from ...utils.loops import TimedLooper
@@ -11,26 +11,72 @@ import time
 import importlib
 import io
 import contextlib
+import functools
+import heapq
+import itertools
+import operator
 import sys
-from typing import Dict,Tuple,Set,List,Optional
+import threading
+import traceback
+import types
+import keyword
+from typing import Dict,Tuple,Set,List,Optional,Callable
 
 EXECUTION_PREFIX = "Execution:"
 EXECUTION_VERBOSITY = 1
 
+#component stdout / stderr is sent to the logging manager once this many lines
+#are buffered, or this many seconds have passed since the last flush
+LOG_OUTPUT_FLUSH_LINES = 100
+LOG_OUTPUT_FLUSH_INTERVAL = 1.0
+
+#health of non-essential components is only checked every this many loops, since
+#a fault in one of them is just reported
+NONESSENTIAL_HEALTH_INTERVAL = 10
+
+#new sensor data wakes the main loop to run components with no rate limit, but
+#no sooner than this many seconds after the last loop, so bursts are merged
+MIN_WAKE_INTERVAL = 0.005
+
+#messages printed when a component in each group is unhealthy: (entering recovery, ignoring)
+_FAULT_MESSAGES = {
+    'perception':("Sensor {} not working, entering recovery mode","Warning, sensor {} not working, ignoring"),
+    'planning':("Planner {} not working, entering recovery mode","Warning, planner {} not working, ignoring"),
+    'other':("Other component {} not working, entering recovery mode","Warning, other component {} not working"),
+    'always_run':("Always-run component {} not working, entering recovery mode","Warning, always-run component {} not working"),
+}
+
+#name of the pipeline run when something goes wrong
+RECOVERY_PIPELINE = sys.intern('recovery')
+
+#phases of the main loop, in execution order, see ExecutorBase._tick_plan
+_PHASES = ('perception','planning','other','always_run')
+_PHASE_PERCEPTION = 0
+
 # Define the computation graph
-COMPONENTS = None 
 COMPONENT_ORDER = None
 COMPONENT_SETTINGS = None
 
 LOGGING_MANAGER = None  # type: LoggingManager
 
+#MPComponentExecutor class, imported on first use since multiprocess_execution imports this module
+_MP_EXECUTOR = None
+
+#names of all AllState attributes, used to sanity check component inputs / outputs
+_ALLSTATE_KEYS = frozenset(f.name for f in fields(AllState))  # type: frozenset
+
 def executor_debug_print(verbosity : int, format : str, *args):
-    """Top level prints. Will be printed to stdout and logged."""
-    if EXECUTION_VERBOSITY >= verbosity:
-        s = format.format(*args)
-        print(EXECUTION_PREFIX,s)
-        if LOGGING_MANAGER is not None:
-            LOGGING_MANAGER.log_component_stdout('Executor',s.split('\n'))
+    """Top level prints. Will be printed to stdout and logged.
+
+    Nothing is formatted unless EXECUTION_VERBOSITY >= verbosity.  On hot
+    paths, check EXECUTION_VERBOSITY before calling to skip building the
+    arguments too."""
+    if verbosity > EXECUTION_VERBOSITY:
+        return
+    s = format.format(*args)
+    print(EXECUTION_PREFIX,s)
+    if LOGGING_MANAGER is not None:
+        LOGGING_MANAGER.log_component_stdout('Executor',s.split('\n'))
 
 def executor_debug_stderr(format : str, *args):
     """Top level stderr prints. Will be printed to stderr and logged."""
@@ -42,21 +88,24 @@ def executor_debug_stderr(format : str, *args):
 def executor_debug_exception(e : Exception, format: str, *args):
     """Top level exceptions. Will be printed to stderr and logged."""
     executor_debug_stderr(format,*args)
-    import traceback
     executor_debug_stderr(traceback.format_exc())
     executor_debug_print(0,format,*args)
     executor_debug_print(0,traceback.format_exc())
 
 
-def normalize_computation_graph(components : list) -> List[Dict]:
-    normalized_components = []
+def normalize_computation_graph(components : list) -> Tuple[List[str],Dict[str,Dict]]:
+    """Normalizes the computation graph settings, returning the component
+    order and a dict mapping each component to its 'inputs' / 'outputs' settings."""
+    order = []
+    component_settings = dict()
     for c in components:
         if isinstance(c,str):
-            normalized_components.append({c:{'inputs':[],'outputs':[]}})
+            order.append(c)
+            component_settings[c] = {'inputs':[],'outputs':[]}
         else:
             assert isinstance(c,dict), "Component {} is not a string or dict".format(c)
             assert len(c) == 1, "Component {} dict has more than one key".format(c)
-            k = list(c.keys())[0]
+            k = next(iter(c))
             v = c[k]
             assert isinstance(v,dict), "Component {} value is not a string or dict".format(c)
             if 'inputs' not in v:
@@ -71,23 +120,34 @@ def normalize_computation_graph(components : list) -> List[Dict]:
                 v['outputs'] = [v['outputs']]
             elif v['outputs'] is None:
                 v['outputs'] = []
-            normalized_components.append({k:v})
-    return normalized_components
+            order.append(k)
+            component_settings[k] = v
+    return order,component_settings
 
 def load_computation_graph():
     """Loads the computation graph from settings[run.computation_graph.components]
-    and sets global variables COMPONENTS, COMPONENT_ORDER, and COMPONENT_SETTINGS."""
-    global COMPONENTS, COMPONENT_ORDER, COMPONENT_SETTINGS
-    COMPONENTS = normalize_computation_graph(settings.get('run.computation_graph.components'))
-    COMPONENT_ORDER = [list(c.keys())[0] for c in COMPONENTS]
-    COMPONENT_SETTINGS = dict(list(c.items())[0] for c in COMPONENTS)
+    and sets global variables COMPONENT_ORDER and COMPONENT_SETTINGS."""
+    global COMPONENT_ORDER, COMPONENT_SETTINGS
+    order, COMPONENT_SETTINGS = normalize_computation_graph(settings.get('run.computation_graph.components'))
+    COMPONENT_ORDER = tuple(order)
+
+#cache of modules imported by import_module_dynamic, keyed by (parent_module, module_name)
+_IMPORT_CACHE = dict()  # type: Dict[Tuple[Optional[str],str],object]
 
 def import_module_dynamic(module_name, parent_module=None):
+    key = (parent_module,module_name)
+    mod = _IMPORT_CACHE.get(key)
+    if mod is not None:
+        return mod
     if parent_module is not None:
         full_path = parent_module + '.' + module_name
     else:
         full_path = module_name
-    return importlib.import_module(full_path)
+    mod = sys.modules.get(full_path)
+    if mod is None:
+        mod = importlib.import_module(full_path)
+    _IMPORT_CACHE[key] = mod
+    return mod
 
 
 def make_class(config_info, component_module, parent_module=None, extra_args = None):
@@ -141,13 +201,25 @@ def make_class(config_info, component_module, parent_module=None, extra_args = N
             raise
 
 
-def validate_components(components : Dict[str,ComponentExecutor], provided : List = None):
-    """Checks whether the defined components match the known computation graph"""
-    state = asdict(AllState.zero())
+def _freeze(config_info):
+    """Converts a (possibly nested) config item into a hashable key."""
+    if isinstance(config_info,dict):
+        return frozenset((k,_freeze(v)) for k,v in config_info.items())
+    elif isinstance(config_info,(list,tuple)):
+        return tuple(_freeze(v) for v in config_info)
+    elif isinstance(config_info,set):
+        return frozenset(_freeze(v) for v in config_info)
+    return config_info
+
+
+def validate_components(components : Dict[str,ComponentExecutor], provided : Optional[Set[str]] = None) -> Set[str]:
+    """Checks whether the defined components match the known computation graph.
+
+    Returns the set of state items provided after running these components.
+    If `provided` is given, it is updated in place and returned.
+    """
     if provided is None:
         provided = set()
-    else:
-        provided = set(provided)
     provided_all = False
     for k in COMPONENT_ORDER:
         if k not in components:
@@ -162,7 +234,7 @@ def validate_components(components : Dict[str,ComponentExecutor], provided : Lis
                 assert possible_inputs == ['all'], "Component {} inputs are not provided by previous components".format(k)
             else:
                 assert provided_all or i in provided, "Component {} input {} is not provided by previous components".format(k,i)
-                if i not in state:
+                if i not in _ALLSTATE_KEYS:
                     executor_debug_print(0,"Component {} input {} does not exist in AllState object",k,i)
                 if possible_inputs != ['all']:
                     assert i in possible_inputs, "Component {} is not supposed to receive input {}".format(k,i)
@@ -175,14 +247,14 @@ def validate_components(components : Dict[str,ComponentExecutor], provided : Lis
         for o in outputs:
             if 'all' != o:
                 provided.add(o)
-                if o not in state:
+                if o not in _ALLSTATE_KEYS:
                     executor_debug_print(0,"Component {} output {} does not exist in AllState object",k,o)
             else:
                 provided_all = True
     for k,c in components.items():
         executor_debug_print(0,"Component {} uses implementation {}",k,c.c.__class__.__name__)
         assert k in COMPONENT_SETTINGS, "Component {} is not known".format(k)
-    return list(provided)
+    return provided
 
 
 class Debugger:
@@ -216,124 +288,323 @@ class ChildDebugger:
 
 
 
+class _NullOutput(io.TextIOBase):
+    """A stdout / stderr replacement that discards everything written to it."""
+    def writable(self):
+        return True
+
+    def write(self, s):
+        return len(s)
+
+_NULL_OUTPUT = _NullOutput()
+
+
 class ComponentExecutor:
     """Polls for whether a component should be updated, and reads/writes
     inputs / outputs to the AllState object."""
     def __init__(self, c : Component, essential : bool = True):
         self.c = c
+        self._cname = c.__class__.__name__
         self.essential = essential
         self.do_debug = True
         self.print_stdout = True
         self.print_stderr = False
         self.inputs = c.state_inputs()
         self.output = c.state_outputs()
+        #pre-resolved accessor for the inputs, so update_now does a single call per tick
+        self._all_inputs = (self.inputs == ['all'])
+        if self.inputs and not self._all_inputs:
+            self._attrget = operator.attrgetter(*self.inputs)
+        else:
+            self._attrget = None
+        #(output, output update time) attribute names written in update_now
+        self._out_pairs = tuple((o,o+'_update_time') for o in self.output)
         self.last_update_time = None
-        self.next_update_time = None
+        #schedule is kept in integer nanoseconds of vehicle time so it doesn't drift over long runs
+        self._next_update_ns = None  # type: Optional[int]
         rate = c.rate()
         self.had_exception = False
+        #bit of this executor in its owner's fault mask, see ExecutorBase._register_health
+        self._fault_owner = None
+        self._fault_bit = 0
+        #whether healthy() can change without mark_unhealthy / mark_healthy being called,
+        #in which case it has to be polled every loop
+        self._poll_health = (type(self).healthy is not ComponentExecutor.healthy or type(c).healthy is not Component.healthy)
         self.dt = 1.0/rate if rate is not None else 0.0
         self.num_overruns = 0
         self.overrun_amount = 0.0
         self.do_update = None
+        #function called on update, resolved from do_update in start()
+        self._update_fn = c.update
+        #whether stdout / stderr need to be captured during update, rather than discarded. Refreshed in start()
+        self._capture_enabled = True
+        #(vehicle time, lines) output waiting to be sent to the logging manager
+        self._stdout_buf = []  # type: List[Tuple[float,List[str]]]
+        self._stderr_buf = []  # type: List[Tuple[float,List[str]]]
+        self._num_buffered_lines = 0
+        self._last_flush_time = time.monotonic()
     
+    @property
+    def dt(self) -> float:
+        return self._dt
+
+    @dt.setter
+    def dt(self, value : float):
+        self._dt = value
+        self._dt_ns = round(value*1e9)
+
+    @property
+    def next_update_time(self) -> Optional[float]:
+        return self._next_update_ns*1e-9 if self._next_update_ns is not None else None
+
     def set_debugger(self, debugger):
         if self.do_debug:
-            self.c.debugger = ChildDebugger(debugger, self.c.__class__.__name__)
+            self.c.debugger = ChildDebugger(debugger, self._cname)
     
     def healthy(self):
         return self.c.healthy() and not self.had_exception
 
+    def mark_unhealthy(self):
+        """Flags this component as faulted and sets its bit in the owning
+        executor's fault mask."""
+        self.had_exception = True
+        if self._fault_owner is not None:
+            self._fault_owner._fault_mask |= self._fault_bit
+
+    def mark_healthy(self):
+        """Clears a fault flagged by :meth:`mark_unhealthy`."""
+        self.had_exception = False
+        if self._fault_owner is not None:
+            self._fault_owner._fault_mask &= ~self._fault_bit
+
     def start(self):
         self.c.initialize()
+        self._update_fn = self.do_update if self.do_update is not None else self.c.update
+        self._specialize_update_now()
+        self._capture_enabled = self.print_stdout or self.print_stderr or (LOGGING_MANAGER is not None and LOGGING_MANAGER.logging())
 
     def stop(self):
         self.c.cleanup()
+        self.flush_output()
 
     def update(self, t : float, state : AllState):
-        if self.next_update_time is None or t >= self.next_update_time:
-            t0 = time.time()
-            self.update_now(t,state)
-            t1 = time.time()
-            self.last_update_time = t
-            if self.next_update_time is None:
-                self.next_update_time = t + self.dt
-            else:
-                self.next_update_time += self.dt
-            if self.next_update_time < t and self.dt > 0:
-                if t1 - t0 > self.dt:
-                    executor_debug_print(1,"Component {} is running behind, time {} overran dt {} by {} s",self.c.__class__.__name__,t1-t0,self.dt,t-self.next_update_time)
-                else:
-                    executor_debug_print(1,"Component {} is running behind (pushed back) overran dt {} by {} s",self.c.__class__.__name__,t1-t0,self.dt,t-self.next_update_time)
-                self.num_overruns += 1
-                self.overrun_amount += t - self.next_update_time
-                self.next_update_time = t + self.dt
+        t_ns = round(t*1e9)
+        if self._next_update_ns is None or t_ns >= self._next_update_ns:
+            self.fire(t,state,t_ns)
             return True
-        executor_debug_print(3,"Component {}","not updating at time {}, next update time is {}",self.c.__class__.__name__,t,self.next_update_time)
+        if EXECUTION_VERBOSITY >= 3:
+            executor_debug_print(3,"Component {}","not updating at time {}, next update time is {}",self._cname,t,self.next_update_time)
         return False
 
+    def fire(self, t : float, state : AllState, t_ns : Optional[int] = None):
+        """Runs the update that :meth:`update` runs once the component is due,
+        and advances next_update_time.  Used by schedulers that track the
+        component's deadline themselves.  t_ns is t in integer nanoseconds,
+        if the caller has already computed it."""
+        if t_ns is None:
+            t_ns = round(t*1e9)
+        t0 = time.monotonic_ns()
+        self.update_now(t,state)
+        t1 = time.monotonic_ns()
+        self.last_update_time = t
+        dt_ns = self._dt_ns
+        if self._next_update_ns is None:
+            self._next_update_ns = t_ns + dt_ns
+        else:
+            self._next_update_ns += dt_ns
+        if self._next_update_ns < t_ns and dt_ns > 0:
+            behind = (t_ns - self._next_update_ns)*1e-9
+            if EXECUTION_VERBOSITY >= 1:
+                duration = (t1 - t0)*1e-9
+                if duration > self.dt:
+                    executor_debug_print(1,"Component {} is running behind, time {} overran dt {} by {} s",self._cname,duration,self.dt,behind)
+                else:
+                    executor_debug_print(1,"Component {} is running behind (pushed back) overran dt {} by {} s",self._cname,duration,self.dt,behind)
+            self.num_overruns += 1
+            self.overrun_amount += behind
+            self._next_update_ns = t_ns + dt_ns
+
+    def _call_update(self, *args):
+        try:
+            return self._update_fn(*args)
+        except Exception as e:
+            executor_debug_exception(e,"Exception in component {}: {}",self._cname,e)
+            self.mark_unhealthy()
+            return None
+
     def _do_update(self, t:float, *args):
+        if not self._capture_enabled:
+            #output is neither printed nor logged, so just discard it
+            with contextlib.redirect_stdout(_NULL_OUTPUT):
+                with contextlib.redirect_stderr(_NULL_OUTPUT):
+                    return self._call_update(*args)
         f = io.StringIO()
         g = io.StringIO()
         with contextlib.redirect_stdout(f):
             with contextlib.redirect_stderr(g):
-                try:
-                    if self.do_update is not None:
-                        res = self.do_update(*args)
-                    else:
-                        res = self.c.update(*args)
-                except Exception as e:
-                    executor_debug_exception(e,"Exception in component {}: {}",self.c.__class__.__name__,e)
-                    self.had_exception = True
-                    res = None
+                res = self._call_update(*args)
         self.log_output(f.getvalue(),g.getvalue())
         return res
 
     def update_now(self, t:float, state : AllState):
         """Performs the updates for this component, without fussing with the polling scheduling"""
-        if self.inputs == ['all']:
+        if self._all_inputs:
             args = (state,)
+        elif self._attrget is None:
+            args = ()
+        elif len(self.inputs) == 1:
+            args = (self._attrget(state),)
         else:
-            args = tuple([getattr(state,i) for i in self.inputs])
-        executor_debug_print(2,"Updating {}",self.c.__class__.__name__)
+            args = self._attrget(state)
+        if EXECUTION_VERBOSITY >= 2:
+            executor_debug_print(2,"Updating {}",self._cname)
         #capture stdout/stderr
 
         res = self._do_update(t, *args)
         #write result to state
         if res is not None:
-            if len(self.output) > 1:
-                assert len(res) == len(self.output), "Component {} output {} does not match expected length {}".format(self.c.__class__.__name__,self.output,len(self.output))
-                for (k,v) in zip(self.output,res):
+            if len(self._out_pairs) > 1:
+                assert len(res) == len(self._out_pairs), "Component {} output {} does not match expected length {}".format(self._cname,self.output,len(self.output))
+                for ((k,kt),v) in zip(self._out_pairs,res):
                     setattr(state,k, v)
-                    setattr(state,k+'_update_time', t)
+                    setattr(state,kt, t)
             else:
-                setattr(state,self.output[0],  res)
-                setattr(state,self.output[0]+'_update_time', t)
+                (k,kt) = self._out_pairs[0]
+                setattr(state,k, res)
+                setattr(state,kt, t)
+
+    def _specialize_update_now(self):
+        """Replaces update_now on this instance with a function generated for
+        this component's inputs and outputs, so that no per-update looping or
+        branching over them is needed.  The generic update_now is kept if the
+        inputs / outputs can't be written as plain attribute accesses.
+        """
+        names = [] if self._all_inputs else list(self.inputs)
+        names += self.output
+        if len(self.output) == 0 or not all(n.isidentifier() and not keyword.iskeyword(n) for n in names):
+            return
+        if self._all_inputs:
+            args = 't, state'
+        else:
+            args = ', '.join(['t'] + ['state.'+i for i in self.inputs])
+        lines = ['def update_now(self, t, state):',
+                 '    if EXECUTION_VERBOSITY >= 2:',
+                 '        executor_debug_print(2,"Updating {}",self._cname)',
+                 '    res = self._do_update({})'.format(args),
+                 '    if res is not None:']
+        if len(self.output) > 1:
+            lines.append('        assert len(res) == {}, "Component {{}} output {{}} does not match expected length {{}}".format(self._cname,self.output,len(self.output))'.format(len(self.output)))
+            lines.append('        ({},) = res'.format(', '.join('r%d'%i for i in range(len(self.output)))))
+            for i,o in enumerate(self.output):
+                lines.append('        state.{} = r{}'.format(o,i))
+                lines.append('        state.{}_update_time = t'.format(o))
+        else:
+            lines.append('        state.{} = res'.format(self.output[0]))
+            lines.append('        state.{}_update_time = t'.format(self.output[0]))
+        ns = {}
+        exec(compile('\n'.join(lines),'<update_now {}>'.format(self._cname),'exec'),ns)
+        #bind to this module's globals so EXECUTION_VERBOSITY changes are seen
+        f = types.FunctionType(ns['update_now'].__code__,globals(),'update_now')
+        self.update_now = types.MethodType(f,self)
 
     def log_output(self,stdout,stderr):
-        if stdout:
-            lines = stdout.split('\n')
-            if len(lines) > 0 and len(lines[-1])==0:
-                lines = lines[:-1]
+        if stdout and (self.print_stdout or LOGGING_MANAGER is not None):
+            lines = stdout.splitlines()
             if self.print_stdout:
-                print("------ Component",self.c.__class__.__name__,"stdout ---------")
+                print("------ Component",self._cname,"stdout ---------")
                 for l in lines:
                     print("   ",l)
                 print("-------------------------------------------")
             if LOGGING_MANAGER is not None:
-                LOGGING_MANAGER.log_component_stdout(self.c.__class__.__name__, lines)
-        if stderr:
-            lines = stderr.split('\n')
-            if len(lines) > 0 and len(lines[-1])==0:
-                lines = lines[:-1]
+                self._stdout_buf.append((LOGGING_MANAGER.vehicle_time,lines))
+                self._num_buffered_lines += len(lines)
+        if stderr and (self.print_stderr or LOGGING_MANAGER is not None):
+            lines = stderr.splitlines()
             if self.print_stderr:
-                print("------ Component",self.c.__class__.__name__,"stderr ---------")
+                print("------ Component",self._cname,"stderr ---------")
                 for l in lines:
                     print("   ",l)
                 print("-------------------------------------------")
             if LOGGING_MANAGER is not None:
-                LOGGING_MANAGER.log_component_stderr(self.c.__class__.__name__, lines)
-
-
+                self._stderr_buf.append((LOGGING_MANAGER.vehicle_time,lines))
+                self._num_buffered_lines += len(lines)
+        if self._num_buffered_lines > 0:
+            if self._num_buffered_lines >= LOG_OUTPUT_FLUSH_LINES or time.monotonic() - self._last_flush_time > LOG_OUTPUT_FLUSH_INTERVAL:
+                self.flush_output()
+
+    def flush_output(self):
+        """Sends any buffered stdout / stderr output to the logging manager."""
+        if LOGGING_MANAGER is not None:
+            if self._stdout_buf:
+                LOGGING_MANAGER.log_component_output(self._cname, self._stdout_buf)
+            if self._stderr_buf:
+                LOGGING_MANAGER.log_component_output(self._cname, self._stderr_buf, stderr=True)
+        self._stdout_buf = []
+        self._stderr_buf = []
+        self._num_buffered_lines = 0
+        self._last_flush_time = time.monotonic()
+
+
+
+class ComponentScheduler:
+    """Keeps component executors in a heap keyed by their next update time,
+    so that the main loop only visits the components that are due and can
+    sleep until the next one is.
+
+    Deadlines are each component's own next update time, in integer
+    nanoseconds of vehicle time, as advanced by ComponentExecutor.fire.
+    Components with dt = 0 (no rate limit) are due on every loop.
+
+    If group_bits is given, it maps each component to a bitmask of the groups
+    it belongs to, and :meth:`pop_due` sets due_groups to the union of the
+    masks of the due components, so that groups with nothing due can be
+    skipped.
+    """
+    def __init__(self, components : List[ComponentExecutor], group_bits : Optional[Dict[ComponentExecutor,int]] = None):
+        self.every_loop = []  # type: List[ComponentExecutor]
+        self.heap = []        # type: List[Tuple[int,int,ComponentExecutor,int]]
+        self._group_bits = group_bits if group_bits is not None else {}
+        self._every_loop_groups = 0
+        self.due_groups = 0
+        self._seq = 0
+        for c in dict((id(c),c) for c in components).values():
+            if c._dt_ns == 0:
+                self.every_loop.append(c)
+                self._every_loop_groups |= self._group_bits.get(c,0)
+            else:
+                self.push(c)
+
+    def push(self, c : ComponentExecutor):
+        #components that never ran are due immediately
+        deadline_ns = c._next_update_ns if c._next_update_ns is not None else -1
+        heapq.heappush(self.heap,(deadline_ns,self._seq,c,self._group_bits.get(c,0)))
+        self._seq += 1
+
+    def pop_due(self, now_ns : int) -> Set[ComponentExecutor]:
+        """Removes and returns all components due at time now_ns (in integer
+        nanoseconds).  Call :meth:`reschedule` on the result once they have
+        been updated with :meth:`ComponentExecutor.fire`."""
+        due = set(self.every_loop)
+        due_groups = self._every_loop_groups
+        heap = self.heap
+        while heap and heap[0][0] <= now_ns:
+            _,_,c,bits = heapq.heappop(heap)
+            due.add(c)
+            due_groups |= bits
+        self.due_groups = due_groups
+        return due
+
+    def reschedule(self, due : Set[ComponentExecutor]):
+        """Pushes the components returned by :meth:`pop_due` back with the
+        next update times that firing them set."""
+        for c in due:
+            if c._dt_ns != 0:
+                self.push(c)
+
+    def next_deadline(self) -> Optional[float]:
+        """Returns the earliest next update time, or None if no component is
+        rate limited."""
+        return self.heap[0][0]*1e-9 if self.heap else None
 
 
 class ExecutorBase:
@@ -341,7 +612,8 @@ class ExecutorBase:
     Subclasses should implement begin(), update(), done(), and end() methods."""
     def __init__(self, vehicle_interface):
         self.vehicle_interface = vehicle_interface
-        self.all_components = dict()  # type: Dict[str,ComponentExecutor]
+        self.all_components = dict()  # type: Dict[tuple,ComponentExecutor]
+        self._component_list = []     # type: List[ComponentExecutor]
         self.always_run_components = dict()      # type: Dict[str,ComponentExecutor]
         self.pipelines = dict()       # type: Dict[str,Tuple[Dict[str,ComponentExecutor],Dict[str,ComponentExecutor],Dict[str,ComponentExecutor]]]
         self.current_pipeline = 'drive'  # type: str
@@ -351,6 +623,32 @@ class ExecutorBase:
         self.debugger.add_handler(self.logging_manager)
         self.last_loop_time = time.time()
         self.last_hardware_faults = set()
+        self._loop_dt_cache = dict()  # type: Dict[Tuple[str,bool],float]
+        self._groups_cache = dict()   # type: Dict[str,Tuple[Tuple[Tuple[str,ComponentExecutor],...],...]]
+        self._tick_plans = dict()     # type: Dict[str,tuple]
+        self._tick_functions = dict() # type: Dict[str,Callable]
+        #bit i is set when the i'th registered component has been marked unhealthy
+        self._fault_mask = 0
+        self._num_registered = 0
+        #set to wake the main loop early, see poll_now()
+        self._wake = threading.Event()
+        self.vehicle_interface.add_data_listener(self.poll_now)
+
+    @property
+    def current_pipeline(self) -> str:
+        return self._current_pipeline
+
+    @current_pipeline.setter
+    def current_pipeline(self, name : str):
+        self._current_pipeline = sys.intern(name)
+        #checked on every health check, so compare once here
+        self._in_recovery = (self._current_pipeline is RECOVERY_PIPELINE)
+
+    def poll_now(self):
+        """Wakes the main loop if it is sleeping until the next component is
+        due.  Can be called from any thread; the vehicle interface calls this
+        whenever new sensor data arrives."""
+        self._wake.set()
 
     def begin(self):
         """Override me to do any initialization.  The vehicle will have
@@ -378,7 +676,7 @@ class ExecutorBase:
         If the component was marked as being a replayed component, will return an executor of a
         LogReplay object.
         """
-        identifier = str((component_name,config_info))
+        identifier = (component_name,_freeze(config_info))
         if identifier in self.all_components:
             return self.all_components[identifier]
         else:
@@ -395,8 +693,10 @@ class ExecutorBase:
                 component = replacement
             if isinstance(config_info,dict) and config_info.get('multiprocess',False):
                 #wrap component in a multiprocess executor.  TODO: not tested yet
-                from .multiprocess_execution import MPComponentExecutor
-                executor = MPComponentExecutor(component)
+                global _MP_EXECUTOR
+                if _MP_EXECUTOR is None:
+                    from .multiprocess_execution import MPComponentExecutor as _MP_EXECUTOR
+                executor = _MP_EXECUTOR(component)
             else:
                 executor = ComponentExecutor(component)
             if isinstance(config_info,dict):
@@ -407,11 +707,26 @@ class ExecutorBase:
                 executor.do_debug = config_info.get('debug',True)
             executor.set_debugger(self.debugger)
             self.all_components[identifier] = executor
+            self._component_list.append(executor)
+            self._register_health(executor)
             return executor
+
+    def _register_health(self, c : ComponentExecutor):
+        """Assigns c a bit in this executor's fault mask, if it doesn't have
+        one already."""
+        if c._fault_owner is self:
+            return
+        c._fault_owner = self
+        c._fault_bit = 1 << self._num_registered
+        self._num_registered += 1
+        if c.had_exception:
+            self._fault_mask |= c._fault_bit
     
     def always_run(self, component_name, component: ComponentExecutor):
         """Adds a component the always-run set."""
         self.always_run_components[component_name] = component
+        self._register_health(component)
+        self._pipelines_changed()
 
     def add_pipeline(self,name : str, perception : Dict[str,ComponentExecutor], planning : Dict[str,ComponentExecutor], other : Dict[str,ComponentExecutor]):
         """Creates a new pipeline with the given components.  The pipeline will be
@@ -421,6 +736,48 @@ class ExecutorBase:
         output = validate_components(planning, output)
         validate_components(other, output)
         self.pipelines[name] = (perception,planning,other)
+        for c in itertools.chain(perception.values(),planning.values(),other.values()):
+            self._register_health(c)
+        self._pipelines_changed()
+
+    def _pipelines_changed(self):
+        """Clears everything cached per pipeline."""
+        self._loop_dt_cache.clear()
+        self._groups_cache.clear()
+        self._tick_plans.clear()
+        self._tick_functions.clear()
+
+    def _component_groups(self, pipeline : str) -> Tuple[Tuple[Tuple[str,ComponentExecutor],...],...]:
+        """Returns the (name, executor) pairs of the given pipeline's
+        perception, planning, and other components and of the always-run
+        components, each in the order they are run.  The result is cached
+        until the pipelines change.
+        """
+        groups = self._groups_cache.get(pipeline)
+        if groups is None:
+            (perception_components,planning_components,other_components) = self.pipelines[pipeline]
+            groups = (self._ordered_components(perception_components),
+                      self._ordered_components(planning_components),
+                      self._ordered_components(other_components),
+                      self._ordered_components(self.always_run_components,force=True))
+            self._groups_cache[pipeline] = groups
+        return groups
+
+    def _loop_dt(self, pipeline : str, perception_only : bool = False) -> float:
+        """Returns the main loop period for the given pipeline, i.e., the
+        smallest nonzero dt of its components and the always-run components.
+        If perception_only = True, the planning and other components are
+        excluded.  The result is cached until the pipelines change.
+        """
+        key = (pipeline,perception_only)
+        dt_min = self._loop_dt_cache.get(key)
+        if dt_min is None:
+            groups = self._component_groups(pipeline)
+            if perception_only:
+                groups = (groups[0],groups[3])
+            dt_min = min(c.dt for _,c in itertools.chain.from_iterable(groups) if c.dt != 0.0)
+            self._loop_dt_cache[key] = dt_min
+        return dt_min
 
     def set_log_folder(self,folder : str):
         self.logging_manager.set_log_folder(folder)
@@ -486,7 +843,7 @@ class ExecutorBase:
             executor_debug_print(0,"Initial pipeline {} not found",self.current_pipeline)
             return
         #must have recovery pipeline
-        if 'recovery' not in self.pipelines:
+        if RECOVERY_PIPELINE not in self.pipelines:
             executor_debug_print(0,"'recovery' pipeline not found")
             return
         #did we ask to replay any components that don't exist in any pipelines?
@@ -500,129 +857,129 @@ class ExecutorBase:
                 raise ValueError("Replay component",c,"not found in any pipeline")
 
         #start running components
-        for k,c in self.all_components.items():
+        components = tuple(self._component_list)
+        for c in components:
             c.start()
         
-        #start running mission
-        self.state = AllState.zero()
-        self.state.mission.type = MissionEnum.IDLE
-        
-        validated = False
         try:
-            validated = self.validate_sensors()
-            if not validated:
-                self.event("Sensor validation failed","Could not validate sensors, stopping components and exiting")
+            #start running mission
+            self.state = AllState.zero()
+            self.state.mission.type = MissionEnum.IDLE
+        
+            validated = False
+            try:
+                validated = self.validate_sensors()
+                if not validated:
+                    self.event("Sensor validation failed","Could not validate sensors, stopping components and exiting")
+                    self.set_exit_reason("Sensor validation failed")
+            except KeyboardInterrupt:
+                self.event("Ctrl+C interrupt during sensor validation","Could not validate sensors, stopping components and exiting")
                 self.set_exit_reason("Sensor validation failed")
-        except KeyboardInterrupt:
-            self.event("Ctrl+C interrupt during sensor validation","Could not validate sensors, stopping components and exiting")
-            self.set_exit_reason("Sensor validation failed")
-            if time.time() - self.last_loop_time > 0.5:
-                import traceback
-                executor_debug_print(1,"A component may have hung. Traceback:\n{}",traceback.format_exc())
-
-        if validated:
-            self.begin()
-            while True:
-                self.state.t = self.vehicle_interface.time()
-                self.logging_manager.pipeline_start_event(self.current_pipeline)
-                try:
-                    executor_debug_print(1,"Executing pipeline {}",self.current_pipeline)
-                    next = self.run_until_switch()
-                    if next is None:
-                        #done
-                        self.set_exit_reason("normal exit")
-                        break
-                    if next not in self.pipelines:
-                        executor_debug_print(1,"Pipeline {} not found, switching to recovery",next)
-                        next = 'recovery'
-                    if self.current_pipeline == 'recovery' and next == 'recovery':
-                        executor_debug_print(1,"\
-                                             ************************************************\
-                                                Recovery pipeline is not working, exiting!   \
-                                             ************************************************")
-                        self.set_exit_reason("recovery pipeline not working")
-                        break
-                    self.current_pipeline = next
-                    if not self.validate_sensors(1):
-                        self.event("Sensors in desired pipeline {} are not working, switching to recovery".format(self.current_pipeline))
-                        self.current_pipeline = 'recovery'
-                except KeyboardInterrupt:
-                    if self.current_pipeline == 'recovery':
-                        executor_debug_print(1,"\
-                                             ************************************************\
-                                                 Ctrl+C interrupt during recovery, exiting!  \
-                                             ************************************************")
-                        self.set_exit_reason("Ctrl+C interrupt during recovery")
-                        break
-                    self.current_pipeline = 'recovery'
-                    self.event("Ctrl+C pressed, switching to recovery mode")
-                    if time.time() - self.last_loop_time > 0.5:
-                        import traceback
-                        executor_debug_print(1,"A component may have hung. Traceback:\n{}",traceback.format_exc())
-            self.end()
-            #done with mission
-            self.event("Mission execution ended","Done with mission execution, stopping components and exiting")
-        #cleanup, whether validated or not
-
-        for k,c in self.all_components.items():
-            executor_debug_print(2,"Stopping",k)
-            c.stop()
-
-        self.logging_manager.close()
-        executor_debug_print(0,"Done with execution loop")
+                if time.time() - self.last_loop_time > 0.5:
+                    executor_debug_print(1,"A component may have hung. Traceback:\n{}",traceback.format_exc())
+
+            if validated:
+                self.begin()
+                while True:
+                    self.state.t = self.vehicle_interface.time()
+                    self.logging_manager.pipeline_start_event(self.current_pipeline)
+                    try:
+                        executor_debug_print(1,"Executing pipeline {}",self.current_pipeline)
+                        next = self.run_until_switch()
+                        if next is None:
+                            #done
+                            self.set_exit_reason("normal exit")
+                            break
+                        if next not in self.pipelines:
+                            executor_debug_print(1,"Pipeline {} not found, switching to recovery",next)
+                            next = RECOVERY_PIPELINE
+                        if self._in_recovery and next == RECOVERY_PIPELINE:
+                            executor_debug_print(1,"\
+                                                 ************************************************\
+                                                    Recovery pipeline is not working, exiting!   \
+                                                 ************************************************")
+                            self.set_exit_reason("recovery pipeline not working")
+                            break
+                        self.current_pipeline = next
+                        if not self.validate_sensors(1):
+                            self.event("Sensors in desired pipeline {} are not working, switching to recovery".format(self.current_pipeline))
+                            self.current_pipeline = RECOVERY_PIPELINE
+                    except KeyboardInterrupt:
+                        if self._in_recovery:
+                            executor_debug_print(1,"\
+                                                 ************************************************\
+                                                     Ctrl+C interrupt during recovery, exiting!  \
+                                                 ************************************************")
+                            self.set_exit_reason("Ctrl+C interrupt during recovery")
+                            break
+                        self.current_pipeline = RECOVERY_PIPELINE
+                        self.event("Ctrl+C pressed, switching to recovery mode")
+                        if time.time() - self.last_loop_time > 0.5:
+                            executor_debug_print(1,"A component may have hung. Traceback:\n{}",traceback.format_exc())
+                self.end()
+                #done with mission
+                self.event("Mission execution ended","Done with mission execution, stopping components and exiting")
+        finally:
+            #cleanup, whether validated or not, and even if a component raised,
+            #so that buffered component output is written out
+            for c in components:
+                if EXECUTION_VERBOSITY >= 2:
+                    executor_debug_print(2,"Stopping {}",c._cname)
+                c.stop()
+            #always-run loggers aren't necessarily in all_components
+            for c in self.always_run_components.values():
+                c.flush_output()
+
+            self.logging_manager.close()
+            executor_debug_print(0,"Done with execution loop")
 
     def check_for_hardware_faults(self):
         """Handles vehicle fault checking / logging"""
-        faults = self.vehicle_interface.hardware_faults()
-        new_faults = []
-        printed_faults = []
-        for f in faults:
+        faults = frozenset(self.vehicle_interface.hardware_faults())
+        printed_faults = faults
+        if 'disengaged' in faults and not settings.get('run.require_engaged',False):
+            printed_faults = faults - {'disengaged'}
+        new_faults = printed_faults - self.last_hardware_faults
+        for f in sorted(new_faults):
             if f == 'disengaged':
-                if not settings.get('run.require_engaged',False):
-                    continue
-                if not f in self.last_hardware_faults:
-                    self.event("Vehicle disengaged")
-                    new_faults.append(f)
-                printed_faults.append(f)
+                self.event("Vehicle disengaged")
             else:
-                if not f in self.last_hardware_faults:
-                    self.event("Hardware fault {}".format(f))
-                    new_faults.append(f)
-                printed_faults.append(f)
+                self.event("Hardware fault {}".format(f))
         if printed_faults:
             if EXECUTION_VERBOSITY >= 1:
-                fault_strings = [(f + " (new)" if f in new_faults else f) for f in printed_faults]
+                fault_strings = [(f + " (new)" if f in new_faults else f) for f in sorted(printed_faults)]
                 executor_debug_print(1,"Hardware faults:",'\n   '.join(fault_strings))
             elif new_faults:
-                executor_debug_print(0,"Hardware fault:",", ".join(new_faults))
+                executor_debug_print(0,"Hardware fault:",", ".join(sorted(new_faults)))
 
-        self.last_hardware_faults = set(faults)
+        self.last_hardware_faults = faults
 
     def validate_sensors(self,numsteps=None):
         """Verifies sensors are working"""
         (perception_components,planning_components,other_components) = self.pipelines[self.current_pipeline]
         if len(perception_components) == 0:
             return True
-        components = list(perception_components.values()) + list(self.always_run_components.values())
-        dt_min = min([c.dt for c in components if c.dt != 0.0])
-        looper = TimedLooper(dt_min,name="main executor")
+        groups = self._component_groups(self.current_pipeline)
+        perception_pairs = groups[0]
+        always_pairs = groups[3]
+        #perception and always-run components are updated in a single pass
+        update_pairs = perception_pairs + always_pairs
+        looper = TimedLooper(self._loop_dt(self.current_pipeline,True),name="main executor")
         sensors_working = False
         num_attempts = 0
         t0 = time.time()
         next_print_time = t0 + 1.0
         while looper and not sensors_working:
-            self.state.t = self.vehicle_interface.time()
-            self.logging_manager.set_vehicle_time(self.state.t)
+            t = self.state.t = self.vehicle_interface.time()
+            self.logging_manager.set_vehicle_time(t)
             self.last_loop_time = time.time()
 
             #check for vehicle faults
             self.check_for_hardware_faults()
 
-            self.update_components(perception_components,self.state)
-            sensors_working = all([c.healthy() for c in perception_components.values()])
-
-            self.update_components(self.always_run_components,self.state,force=True)
-            always_run_working = all([c.healthy() for c in self.always_run_components.values()])
+            self.update_component_list(update_pairs,self.state,t=t)
+            sensors_working = all([c.healthy() for _,c in perception_pairs])
+            always_run_working = all([c.healthy() for _,c in always_pairs])
             if not always_run_working:
                 executor_debug_print(1,"Always-run components not working, ignoring")
 
@@ -636,98 +993,230 @@ class ExecutorBase:
 
     def run_until_switch(self):
         """Runs a pipeline until a switch is requested."""
-        if self.current_pipeline == 'recovery':        
+        if self._in_recovery:
             self.state.mission.type = MissionEnum.RECOVERY_STOP
 
-        (perception_components,planning_components,other_components) = self.pipelines[self.current_pipeline]
-        components = list(perception_components.values()) + list(planning_components.values()) + list(other_components.values()) + list(self.always_run_components.values())
-        dt_min = min([c.dt for c in components if c.dt != 0.0])
-        looper = TimedLooper(dt_min,name="main executor")
-        while looper and not self.done():
-            self.state.t = self.vehicle_interface.time()
-            self.logging_manager.set_vehicle_time(self.state.t)
+        pipeline = self.current_pipeline
+        plan = self._tick_plan(pipeline)
+        tick = self._tick_function(pipeline)
+        #bit of the phase in which each executor fires, see _tick_function
+        group_bits = dict()
+        for (phase,_,c,_) in plan:
+            if c is not None and c not in group_bits:
+                group_bits[c] = 1 << phase
+        scheduler = ComponentScheduler([c for _,_,c,_ in plan if c is not None],group_bits)
+        dt_max = self._loop_dt(pipeline)
+        #none of these change while the pipeline runs, so look them up once
+        state = self.state
+        vehicle_time = self.vehicle_interface.time
+        logging_manager = self.logging_manager
+        check_for_hardware_faults = self.check_for_hardware_faults
+        pop_due = scheduler.pop_due
+        while not self.done():
+            t = state.t = vehicle_time()
+            logging_manager.set_vehicle_time(t)
             self.last_loop_time = time.time()
             #publish ros topics 
-            if(self.logging_manager.rosbag_player):
-                self.logging_manager.rosbag_player.update_topics(self.state.t)
+            if(logging_manager.rosbag_player):
+                logging_manager.rosbag_player.update_topics(t)
 
             #check for vehicle faults
-            self.check_for_hardware_faults()
-                    
-            self.update_components(perception_components,self.state)
-            #check for faults
-            for name,c in perception_components.items():
-                if not c.healthy():
-                    if c.essential and self.current_pipeline != 'recovery':
-                        executor_debug_print(1,"Sensor {} not working, entering recovery mode",name)
-                        return 'recovery'
-                    else:
-                        executor_debug_print(1,"Warning, sensor {} not working, ignoring",name)
-            
-            next_pipeline = self.update(self.state)
-            if next_pipeline is not None and next_pipeline != self.current_pipeline:
-                executor_debug_print(0,"update() requests to switch to pipeline {}",next_pipeline)
+            check_for_hardware_faults()
+
+            t_ns = round(t*1e9)
+            due = pop_due(t_ns)
+            next_pipeline = tick(t,t_ns,state,due,scheduler.due_groups)
+            if next_pipeline is not None:
                 return next_pipeline
 
-            self.update_components(planning_components,self.state)
-            #check for faults
-            for name,c in planning_components.items():
-                if not c.healthy():
-                    if c.essential and self.current_pipeline != 'recovery':
-                        executor_debug_print(1,"Planner {} not working, entering recovery mode",name)
-                        return 'recovery'
-                    else:
-                        executor_debug_print(1,"Warning, planner {} not working, ignoring",name)
-
-            self.update_components(other_components,self.state)
-            for name,c in other_components.items():
-                if not c.healthy():
-                    if c.essential and self.current_pipeline != 'recovery':
-                        executor_debug_print(1,"Other component {} not working, entering recovery mode",name)
-                        return 'recovery'
-                    else:
-                        executor_debug_print(1,"Warning, other component {} not working",name)
-
-            self.update_components(self.always_run_components,self.state,force=True)
-            for name,c in self.always_run_components.items():
-                if not c.healthy():
-                    if c.essential and self.current_pipeline != 'recovery':
-                        executor_debug_print(1,"Always-run component {} not working, entering recovery mode",name)
-                        return 'recovery'
-                    else:
-                        executor_debug_print(1,"Warning, always-run component {} not working",name)
+            scheduler.reschedule(due)
+            self._wait_for_next_update(scheduler,t,dt_max)
 
 
         #self.done() returned True
         return None
 
 
-    def update_components(self, components : Dict[str,ComponentExecutor], state : AllState, now = False, force = False):
+    def _tick_plan(self, pipeline : str) -> Tuple[Tuple[int,Optional[str],Optional[ComponentExecutor],bool],...]:
+        """Returns the plan for the given pipeline: a flat tuple of
+        (phase, name, executor, essential) entries in the order the main loop
+        runs them, where phase indexes _PHASES.  Each phase ends with an entry
+        whose name and executor are None, at which point the phase's health is
+        checked.
+
+        The result is cached until the pipelines change.
+        """
+        plan = self._tick_plans.get(pipeline)
+        if plan is None:
+            groups = self._component_groups(pipeline)
+            entries = []
+            for phase,pairs in enumerate(groups):
+                entries += [(phase,k,c,c.essential) for k,c in pairs]
+                entries.append((phase,None,None,False))
+            plan = tuple(entries)
+            self._tick_plans[pipeline] = plan
+        return plan
+
+    def _tick_function(self, pipeline : str) -> Callable:
+        """Returns a function tick(t, t_ns, state, due, due_groups) that runs
+        one loop of the given pipeline's plan (see :meth:`_tick_plan`): it
+        updates the components in due, checks health at the end of each
+        phase, and calls :meth:`update` after perception.  Phases whose bit
+        is not set in due_groups have nothing due and are skipped, apart from
+        the health check.  Returns the pipeline to switch to, or None to keep
+        running.
+
+        Essential components' health is checked every loop, and that of
+        non-essential components every NONESSENTIAL_HEALTH_INTERVAL loops.
+        Either check is skipped while none of the components it covers has
+        its bit set in the fault mask, unless one of them must be polled.
+
+        The function is generated with the plan unrolled into straight-line
+        code, and is cached until the pipelines change.
+        """
+        tick = self._tick_functions.get(pipeline)
+        if tick is not None:
+            return tick
+        plan = self._tick_plan(pipeline)
+        ns = {'executor':self, 'pipeline':pipeline, 'loops':0,
+              'check_health':self._check_health, 'executor_update':self.update,
+              'log_update':self.logging_manager.log_component_update,
+              'executor_debug_print':executor_debug_print}
+        lines = ['def tick(t, t_ns, state, due, due_groups):',
+                 '    global loops',
+                 '    loops += 1',
+                 '    sample = (loops % {} == 0)'.format(NONESSENTIAL_HEALTH_INTERVAL)]
+        fired = set()
+        phase_lines = []
+        for i,(phase,k,c,essential) in enumerate(plan):
+            if c is not None:
+                #an executor in several phases (e.g., also always-run) only fires in the first
+                if c in fired:
+                    continue
+                fired.add(c)
+                ns['c%d'%i] = c
+                ns['fire%d'%i] = c.fire
+                ns['name%d'%i] = k
+                ns['output%d'%i] = c.output
+                phase_lines.append('        if c{0} in due:'.format(i))
+                phase_lines.append('            fire{0}(t, state, t_ns)'.format(i))
+                phase_lines.append('            log_update(name{0}, state, output{0})'.format(i))
+                continue
+            if phase_lines:
+                lines.append('    if due_groups & {}:'.format(1 << phase))
+                lines += phase_lines
+                phase_lines = []
+            #end of phase: check health
+            group = _PHASES[phase]
+            for essential in (True,False):
+                pairs = tuple((k,c) for (p,k,c,e) in plan if p == phase and c is not None and e == essential)
+                if len(pairs) == 0:
+                    continue
+                var = '{}_{}'.format('essential' if essential else 'nonessential',group)
+                ns[var] = pairs
+                if any(c._poll_health for _,c in pairs):
+                    cond = 'True'
+                else:
+                    cond = 'executor._fault_mask & {}'.format(functools.reduce(operator.or_,(c._fault_bit for _,c in pairs)))
+                if essential:
+                    lines.append('    if {} and check_health({}, {!r}):'.format(cond,var,group))
+                    lines.append("        return 'recovery'")
+                else:
+                    lines.append('    if sample and {}:'.format(cond))
+                    lines.append('        check_health({}, {!r})'.format(var,group))
+            if phase == _PHASE_PERCEPTION:
+                lines.append('    next_pipeline = executor_update(state)')
+                lines.append('    if next_pipeline is not None and next_pipeline != pipeline:')
+                lines.append('        executor_debug_print(0,"update() requests to switch to pipeline {}",next_pipeline)')
+                lines.append('        return next_pipeline')
+        lines.append('    return None')
+        exec(compile('\n'.join(lines),'<tick {}>'.format(pipeline),'exec'),ns)
+        tick = ns['tick']
+        self._tick_functions[pipeline] = tick
+        return tick
+
+    def _wait_for_next_update(self, scheduler : ComponentScheduler, t_loop : float, dt_max : float):
+        """Sleeps until the next component in scheduler is due, but no longer
+        than dt_max after the loop started at t_loop.
+
+        If scheduler has components with no rate limit, :meth:`poll_now`
+        ends the sleep early so they see new sensor data, but no earlier than
+        MIN_WAKE_INTERVAL after t_loop, so that bursts of data are merged
+        into one loop."""
+        vehicle_time = self.vehicle_interface.time
+        deadline = t_loop + dt_max
+        next_deadline = scheduler.next_deadline()
+        if next_deadline is not None:
+            deadline = min(deadline, next_deadline)
+        if not scheduler.every_loop:
+            #nothing more would run on a wake
+            delay = deadline - vehicle_time()
+            if delay > 0:
+                time.sleep(delay)
+        elif self._wake.wait(deadline - vehicle_time()):
+            delay = min(t_loop + MIN_WAKE_INTERVAL, deadline) - vehicle_time()
+            if delay > 0:
+                time.sleep(delay)
+        self._wake.clear()
+
+    def update_components(self, components : Dict[str,ComponentExecutor], state : AllState, now = False, force = False,
+                          t : Optional[float] = None):
         """Updates the components and performs necessary logging.
         
         If now = True, all components are run regardless of polling state.
 
         If force = False, only components listed in COMPONENT_ORDER are run. 
         Otherwise, all components in `components` are run in arbitrary order.
+
+        t is the time of this loop; pass the same value to every call in a
+        loop so that all components see a consistent time.  Defaults to
+        state.t.
         """
-        t = state.t
+        self.update_component_list(self._ordered_components(components,force),state,now,t)
+
+    def _ordered_components(self, components : Dict[str,ComponentExecutor], force = False) -> Tuple[Tuple[str,ComponentExecutor],...]:
+        """Returns the (name, executor) pairs that :meth:`update_components`
+        would run, in the order it would run them."""
         if force:
-            order = list(components.keys())
-        else:
-            order = []
-            for k in COMPONENT_ORDER:
-                if k in components:
-                    order.append(k)
-        for k in order:
-            updated = False
+            return tuple(components.items())
+        return tuple((k,components[k]) for k in COMPONENT_ORDER if k in components)
+
+    def update_component_list(self, pairs : Tuple[Tuple[str,ComponentExecutor],...], state : AllState, now = False,
+                              t : Optional[float] = None):
+        """Updates an already-ordered sequence of (name, executor) pairs in a
+        single pass and performs necessary logging.  Equivalent to
+        :meth:`update_components`, but lets the main loop order the components
+        once per pipeline rather than once per tick.
+        """
+        if t is None:
+            t = state.t
+        for k,c in pairs:
             if now:
-                components[k].update_now(t,state)
+                c.update_now(t,state)
                 updated = True
             else:
-                updated = components[k].update(t,state)
+                updated = c.update(t,state)
             #log component output if necessary
             if updated:
-                self.logging_manager.log_component_update(k, state, components[k].output)
+                self.logging_manager.log_component_update(k, state, c.output)
+
+    def _check_health(self, pairs : Tuple[Tuple[str,ComponentExecutor],...], group : str) -> bool:
+        """Checks the health of (name, executor) pairs from the given group
+        (one of _PHASES).  Unhealthy non-essential components are reported
+        and ignored.  Returns True if an essential component is unhealthy and
+        the executor should switch to recovery.
+        """
+        check_recovery = not self._in_recovery
+        verbose = EXECUTION_VERBOSITY >= 1
+        for k,c in pairs:
+            if not c.healthy():
+                if c.essential and check_recovery:
+                    if verbose:
+                        executor_debug_print(1,_FAULT_MESSAGES[group][0],k)
+                    return True
+                elif verbose:
+                    executor_debug_print(1,_FAULT_MESSAGES[group][1],k)
+        return False
 
 
 class StandardExecutor(ExecutorBase):
@@ -735,12 +1224,13 @@ class StandardExecutor(ExecutorBase):
         ExecutorBase.__init__(self,vehicle_interface)
     
     def done(self):
-        if self.current_pipeline == 'recovery':
-            if self.vehicle_interface.last_reading is not None and \
-                abs(self.vehicle_interface.last_reading.speed) < 1e-3:
+        if self._in_recovery:
+            vi = self.vehicle_interface
+            reading = vi.last_reading
+            if reading is not None and reading.speed*reading.speed < 1e-6:
                 executor_debug_print(1,"Vehicle has stopped, exiting execution loop.")
                 return True
-            if 'disengaged' in self.vehicle_interface.hardware_faults():
+            if 'disengaged' in vi.hardware_faults():
                 executor_debug_print(1,"Vehicle has disengaged, exiting execution loop.")
                 return True
         return False
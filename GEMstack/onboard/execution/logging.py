@@ -1,8 +1,12 @@
 from __future__ import annotations
 from ..component import Component
 from ...utils import serialization,logging,config,settings
-from typing import List,Optional,Dict,Set,Any
+from ...utils.ringbuffer import RingBuffer
+from typing import List,Optional,Dict,Set,Tuple,Any
 import time
+import threading
+import operator
+import copy
 import datetime
 import os
 import subprocess
@@ -144,7 +148,7 @@ class LoggingManager:
         if not self.log_folder:
             return
         if self.behavior_log is None:
-            self.behavior_log = logging.Logfile(os.path.join(self.log_folder,'behavior.json'),delta_format=True,mode='w')
+            self.behavior_log = BackgroundLogfile(logging.Logfile(os.path.join(self.log_folder,'behavior.json'),delta_format=True,mode='w'))
         return VehicleBehaviorLogger(self.behavior_log,vehicle_interface)
     
     def log_state(self,state_attributes : List[str], rate : Optional[float]=None) -> AllStateLogger:
@@ -159,7 +163,7 @@ class LoggingManager:
             return
         if components:
             if self.behavior_log is None:
-                self.behavior_log = logging.Logfile(os.path.join(self.log_folder,'behavior.json'),delta_format=True,mode='w')
+                self.behavior_log = BackgroundLogfile(logging.Logfile(os.path.join(self.log_folder,'behavior.json'),delta_format=True,mode='w'))
         self.logged_components = set(components)
 
     def log_ros_topics(self, topics : List[str], rosbag_options : str = '') -> Optional[str]:
@@ -276,30 +280,35 @@ class LoggingManager:
             self.behavior_log.log(state, outputs, self.vehicle_time)
     
     def log_component_stdout(self, component : str, msg : List[str]) -> None:
-        if not self.log_folder:
-            return
-        if component not in self.component_output_loggers:
-            self.component_output_loggers[component] = [None,None]
-        if self.component_output_loggers[component][0] is None:
-            self.component_output_loggers[component][0] = open(self.component_stdout_file(component),'w')
-        timestr = datetime.datetime.fromtimestamp(self.vehicle_time).strftime("%H:%M:%S.%f")[:-3]
-        for l in msg:
-            self.component_output_loggers[component][0].write(timestr + ': ' + l + '\n')
+        self.log_component_output(component, [(self.vehicle_time,msg)])
 
     def log_component_stderr(self, component : str, msg : List[str]) -> None:
+        self.log_component_output(component, [(self.vehicle_time,msg)], stderr=True)
+
+    def log_component_output(self, component : str, entries : List[Tuple[float,List[str]]], stderr : bool = False) -> None:
+        """Logs a batch of stdout (or stderr, if stderr=True) output from a
+        component.  Each entry is a (vehicle_time, lines) pair."""
         if not self.log_folder:
             return
+        index = 1 if stderr else 0
         if component not in self.component_output_loggers:
             self.component_output_loggers[component] = [None,None]
-        if self.component_output_loggers[component][1] is None:
-            self.component_output_loggers[component][1] = open(self.component_stderr_file(component),'w')
-        timestr = datetime.datetime.fromtimestamp(self.vehicle_time).strftime("%H:%M:%S.%f")[:-3]
-        for l in msg:
-            self.component_output_loggers[component][1].write(timestr + ': ' + l + '\n')
+        f = self.component_output_loggers[component][index]
+        if f is None:
+            fn = self.component_stderr_file(component) if stderr else self.component_stdout_file(component)
+            f = self.component_output_loggers[component][index] = open(fn,'w')
+        chunks = []
+        for (vehicle_time,msg) in entries:
+            timestr = datetime.datetime.fromtimestamp(vehicle_time).strftime("%H:%M:%S.%f")[:-3]
+            for l in msg:
+                chunks.append(timestr + ': ' + l + '\n')
+        f.write(''.join(chunks))
     
     def close(self):
            
-        
+        if self.behavior_log is not None:
+            self.behavior_log.close()
+            self.behavior_log = None
         self.dump_debug()
         self.debug_messages = {}
         if self.rosbag_process is not None:
@@ -324,6 +333,89 @@ class LoggingManager:
     def __del__(self):
         self.close()
             
+class BackgroundLogfile:
+    """Wraps a Logfile so that log() only snapshots the message on the
+    calling thread, and a background thread serializes and writes it.
+
+    The snapshot is a shallow copy of each logged value, so that attributes
+    changed in place after log() is called (e.g., the vehicle reading, or
+    state.mission.type) aren't written.  Changes made inside nested
+    containers of a logged value may still show up.
+
+    log() must always be called from the same thread.  Messages are queued in
+    a RingBuffer with sequence numbers; if it fills up, they spill into a
+    locked overflow list, and the sequence numbers keep them in order when
+    written.  Once the overflow list holds max_overflow messages, further
+    messages are dropped and counted in ``dropped``.
+    """
+    def __init__(self, logfile : logging.Logfile, capacity : int = 1024, flush_interval : float = 0.05,
+                 max_overflow : int = 8192):
+        self.logfile = logfile
+        self.flush_interval = flush_interval
+        self.max_overflow = max_overflow
+        self.dropped = 0
+        self._queue = RingBuffer(capacity)
+        self._overflow = []   # type: List[tuple]
+        self._overflow_lock = threading.Lock()
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self.flush_loop,name='behavior log',daemon=True)
+        self._thread.start()
+
+    def log(self, message, fields=None, t : float = None) -> None:
+        """Queues a snapshot of a message.  Arguments are the same as
+        Logfile.log()."""
+        if isinstance(message,dict):
+            values = {k:copy.copy(v) for k,v in message.items()}
+        elif fields is not None:
+            #grab the field values now, as Logfile.format_line would
+            values = {k:copy.copy(getattr(message,k)) for k in fields}
+            if not self.logfile.delta_format:
+                for k in fields:
+                    values[k+'_update_time'] = getattr(message,k+'_update_time')
+        else:
+            values = copy.copy(message)
+        rec = (self._seq,values,fields,t)
+        self._seq += 1
+        if not self._queue.try_push(rec):
+            with self._overflow_lock:
+                if len(self._overflow) < self.max_overflow:
+                    self._overflow.append(rec)
+                else:
+                    self.dropped += 1
+
+    def flush_loop(self):
+        """Writes queued messages until close() is called."""
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Serializes and writes all queued messages."""
+        records = self._queue.pop_all()
+        if self._overflow:
+            with self._overflow_lock:
+                records += self._overflow
+                self._overflow = []
+            records.sort(key=operator.itemgetter(0))
+        file = self.logfile.file
+        format_line = self.logfile.format_line
+        for seq,message,fields,t in records:
+            try:
+                line = format_line(message,fields,t)
+                file.write(line)
+                file.write('\n')
+            except Exception as e:
+                print("BackgroundLogfile: error writing log record",seq,":",e)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+        self.logfile.close()
+        if self.dropped:
+            print("BackgroundLogfile: dropped",self.dropped,"log records because the writer fell behind")
+
+
 class OneDriveManager():
     def __init__(self):
         self.config_found = False
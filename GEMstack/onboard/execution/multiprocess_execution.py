@@ -28,7 +28,7 @@ class MPComponentExecutor(ComponentExecutor):
         self._amount_delayed = 0.0
     
     def __str__(self):
-        return "MPComponentExecutor(%s)"%self.c.__class__.__name__
+        return "MPComponentExecutor(%s)"%self._cname
 
     def start(self):
         print("STARTING",self)
@@ -42,11 +42,11 @@ class MPComponentExecutor(ComponentExecutor):
         try:
             self._process.start()
         except Exception as e:
-            print("Unable to start process",self.c.__class__.__name__)
+            print("Unable to start process",self._cname)
             print("Exception:",e)
             
             self._process = None
-            raise RuntimeError("Error starting "+self.c.__class__.__name__+" process, usually a pickling error")
+            raise RuntimeError("Error starting "+self._cname+" process, usually a pickling error")
         res = self._out_queue.get()
         if isinstance(res,tuple) and isinstance(res[0],Exception):
             print("Traceback:")
@@ -57,9 +57,9 @@ class MPComponentExecutor(ComponentExecutor):
             self._process.join()
             self._process.close()
             self._process = None
-            raise RuntimeError("Error initializing "+self.c.__class__.__name__)
+            raise RuntimeError("Error initializing "+self._cname)
         if res !='initialized':
-            raise RuntimeError("Uh... didn't hear back from subprocess? "+self.c.__class__.__name__)
+            raise RuntimeError("Uh... didn't hear back from subprocess? "+self._cname)
 
     def stop(self):
         if self._process and self._process.is_alive():
@@ -126,7 +126,7 @@ class MPComponentExecutor(ComponentExecutor):
             self._delay_count = 0
             res = self._out_queue.get()
             if isinstance(res,tuple) and isinstance(res[0],Exception):
-                print("Error in",self.c.__class__.__name__)
+                print("Error in",self._cname)
                 print("Traceback:")
                 for line in res[1]:
                     print(line)
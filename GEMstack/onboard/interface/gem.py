@@ -3,7 +3,7 @@ from ...utils import settings,serialization
 from ...state import VehicleState, ObjectPose, ObjectFrameEnum
 from ...knowledge.vehicle.geometry import front2steer,steer2front,heading_rate
 from ...knowledge.vehicle.dynamics import pedal_positions_to_acceleration, acceleration_to_pedal_positions
-from typing import List,Optional,Callable
+from typing import List,Optional,Callable,FrozenSet
 
 @dataclass
 @serialization.register
@@ -95,6 +95,7 @@ class GEMInterface:
     def __init__(self):
         self.last_command = None  # type: GEMVehicleCommand
         self.last_reading = None  # type: GEMVehicleReading
+        self.data_listeners = []  # type: List[Callable[[],None]]
 
     def start(self):
         pass
@@ -126,10 +127,28 @@ class GEMInterface:
         """
         raise NotImplementedError()
 
-    def hardware_faults(self) -> List[str]:
-        """Returns a list of hardware faults, naming the failed component.
+    def add_data_listener(self, listener : Callable[[],None]) -> None:
+        """Registers a function, called with no arguments, that is notified
+        whenever a subscribed sensor delivers new data.  Listeners may be
+        called from sensor threads."""
+        self.data_listeners.append(listener)
+
+    def _notify_callback(self, callback : Callable) -> Callable:
+        """Wraps a sensor callback so that the data listeners are notified
+        after it is called.  Implementations of subscribe_sensor should wrap
+        their callback with this."""
+        def notifying_callback(*args):
+            callback(*args)
+            for listener in self.data_listeners:
+                listener()
+        return notifying_callback
+
+    def hardware_faults(self) -> FrozenSet[str]:
+        """Returns the set of hardware faults, naming the failed component.
         
-        Can be any sensor, actuator, or other component.
+        Can be any sensor, actuator, or other component.  This is polled
+        every loop, so implementations should return a cached set that is
+        only rebuilt when the faults change.
         """
         raise NotImplementedError()
 
@@ -2,6 +2,7 @@ from .gem import *
 from ...utils import settings
 import math
 import time
+import threading
 
 # ROS Headers
 import rospy
@@ -61,6 +62,9 @@ class GEMHardwareInterface(GEMInterface):
         self.stereo_sub = None
         self.sync = None
         self.faults = []
+        #cached result of hardware_faults(), rebuilt by _update_fault_set
+        self._fault_set = frozenset(["disengaged"])
+        self._fault_lock = threading.Lock()
 
         # -------------------- PACMod setup --------------------
         # GEM vehicle enable
@@ -131,28 +135,32 @@ class GEMHardwareInterface(GEMInterface):
         self.last_reading.steering_wheel_angle = msg.output
     
     def global_callback(self, msg):
-        self.faults = []
+        faults = []
         if msg.override_active:
-            self.faults.append("override_active")
+            faults.append("override_active")
         if msg.config_fault_active:
-            self.faults.append("config_fault_active")
+            faults.append("config_fault_active")
         if msg.user_can_timeout:
-            self.faults.append("user_can_timeout")
+            faults.append("user_can_timeout")
         if msg.user_can_read_errors:
-            self.faults.append("user_can_read_errors")
+            faults.append("user_can_read_errors")
         if msg.brake_can_timeout:
-            self.faults.append("brake_can_timeout")
+            faults.append("brake_can_timeout")
         if msg.steering_can_timeout:
-            self.faults.append("steering_can_timeout")
+            faults.append("steering_can_timeout")
         if msg.vehicle_can_timeout:
-            self.faults.append("vehicle_can_timeout")
+            faults.append("vehicle_can_timeout")
         if msg.subsystem_can_timeout:
-            self.faults.append("subsystem_can_timeout")
+            faults.append("subsystem_can_timeout")
+        if faults != self.faults:
+            self.faults = faults
+            self._update_fault_set()
 
     def get_reading(self) -> GEMVehicleReading:
         return self.last_reading
 
     def subscribe_sensor(self, name, callback, type = None):
+        callback = self._notify_callback(callback)
         if name == 'gnss':
             topic = self.ros_sensor_topics[name]
             if topic.endswith('inspva'):
@@ -277,12 +285,20 @@ class GEMHardwareInterface(GEMInterface):
             self.send_first_command()
         elif self.pacmod_enable == True and msg.data == False:
             print("PACMod disabled")
-        self.pacmod_enable = msg.data
+        if self.pacmod_enable != msg.data:
+            self.pacmod_enable = msg.data
+            self._update_fault_set()
+
+    def _update_fault_set(self):
+        #called from the ROS callback threads whenever faults or pacmod_enable change
+        with self._fault_lock:
+            if self.pacmod_enable == False:
+                self._fault_set = frozenset(self.faults + ["disengaged"])
+            else:
+                self._fault_set = frozenset(self.faults)
 
-    def hardware_faults(self) -> List[str]:
-        if self.pacmod_enable == False:
-            return self.faults + ["disengaged"]
-        return self.faults
+    def hardware_faults(self) -> FrozenSet[str]:
+        return self._fault_set
 
     def send_first_command(self):
         # ---------- Enable PACMod ----------
@@ -1,7 +1,7 @@
 from .gem import GEMInterface, GEMVehicleCommand, GEMVehicleReading
 from .gem_hardware import GEMHardwareInterface
 from .gem_simulator import GEMDoubleIntegratorSimulationInterface
-from typing import Callable, List
+from typing import Callable, FrozenSet
 
 class GEMRealSensorsWithSimMotionInterface(GEMInterface):
     """Class that uses sensors from the physical GEM vehicle but
@@ -12,6 +12,9 @@ class GEMRealSensorsWithSimMotionInterface(GEMInterface):
         self.sim = GEMDoubleIntegratorSimulationInterface(scene)
         self.real = GEMHardwareInterface()
         GEMInterface.__init__(self)
+        #union of the real and sim fault sets, rebuilt only when either set changes
+        self._fault_sources = (None,None)
+        self._fault_set = frozenset()
 
     def start(self):
         self.sim.start()
@@ -35,11 +38,20 @@ class GEMRealSensorsWithSimMotionInterface(GEMInterface):
     def sensors(self):
         return self.real.sensors()
 
+    def add_data_listener(self, listener : Callable[[],None]) -> None:
+        self.sim.add_data_listener(listener)
+        self.real.add_data_listener(listener)
+
     def subscribe_sensor(self, name : str, callback : Callable, type = None) -> None:
         if name in ['gnss','imu']:
             return self.sim.subscribe_sensor(name,callback,type)
         return self.real.subscribe_sensor(name,callback,type)
 
-    def hardware_faults(self) -> List[str]:
-        return self.real.hardware_faults() + self.sim.hardware_faults()
+    def hardware_faults(self) -> FrozenSet[str]:
+        real = self.real.hardware_faults()
+        sim = self.sim.hardware_faults()
+        if real is not self._fault_sources[0] or sim is not self._fault_sources[1]:
+            self._fault_sources = (real,sim)
+            self._fault_set = real | sim if sim else real
+        return self._fault_set
 
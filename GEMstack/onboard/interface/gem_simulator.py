@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, FrozenSet
 from .gem import *
 from ...mathutils.dubins import SecondOrderDubinsCar
 from ...mathutils.dynamics import simulate
@@ -297,14 +297,15 @@ class GEMDoubleIntegratorSimulationInterface(GEMInterface):
         self.thread = None
         print("Done.")
 
-    def hardware_faults(self) -> list:
-        return []    
+    def hardware_faults(self) -> FrozenSet[str]:
+        return frozenset()
     
     def sensors(self):
         #TODO: simulate other sensors?
         return ['gnss','imu','agent_detector']
 
     def subscribe_sensor(self, name, callback, type = None):
+        callback = self._notify_callback(callback)
         if name == 'gnss':
             if type is not None and type is not VehicleState:
                 raise ValueError("GEMDoubleIntegratorSimulationInterface only supports VehicleState for GNSS")
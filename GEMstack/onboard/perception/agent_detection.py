@@ -1,8 +1,8 @@
 from ...state import AllState,VehicleState,ObjectPose,ObjectFrameEnum,AgentState,AgentEnum,AgentActivityEnum
 from ..interface.gem import GEMInterface
 from ..component import Component
+from ...utils.ringbuffer import RingBuffer
 from typing import Dict
-import threading
 import copy
 
 import numpy as np
@@ -13,7 +13,8 @@ class OmniscientAgentDetector(Component):
     def __init__(self, vehicle_interface: GEMInterface):
         self.vehicle_interface = vehicle_interface
         self.agents = {}
-        self.lock = threading.Lock()
+        #(name, agent) pairs received since the last update
+        self.agent_updates = RingBuffer(256)
 
         self.start_pose = None
 
@@ -30,27 +31,27 @@ class OmniscientAgentDetector(Component):
         self.vehicle_interface.subscribe_sensor('agent_detector', self.agent_callback, AgentState)
 
     def agent_callback(self, name: str, agent: AgentState):
-        with self.lock:
-            self.agents[name] = agent
+        self.agent_updates.push((name, agent))
 
     def update(self, vehicle : VehicleState) -> Dict[str, AgentState]:
-        with self.lock:
-            res = {}
-            ped_num = 0
-
-            if self.start_pose is None:
-                self.start_pose = vehicle.pose
-            # print("\nVehicle start state self.start_pose:", self.start_pose)
-            # print("\nVehicle current state:", vehicle.pose, vehicle.v)
-
-            for n, a in self.agents.items():
-                # print("\nBefore to_frame: Agent:", n, a.pose, a.velocity)
-                a = a.to_frame(ObjectFrameEnum.START, current_pose = a.pose, start_pose_abs = self.start_pose)
-                # print("\nAfter to_frame START: Agent:", n, a.pose, a.velocity)
-                # print('==============', a.pose.frame==ObjectFrameEnum.START)
-                res[n] = a
-                if a.type == AgentEnum.PEDESTRIAN:
-                    ped_num += 1
-            if ped_num > 0:
-                print("\nDetected", ped_num, "pedestrians")
-            return res
+        for n, a in self.agent_updates.pop_all():
+            self.agents[n] = a
+        res = {}
+        ped_num = 0
+
+        if self.start_pose is None:
+            self.start_pose = vehicle.pose
+        # print("\nVehicle start state self.start_pose:", self.start_pose)
+        # print("\nVehicle current state:", vehicle.pose, vehicle.v)
+
+        for n, a in self.agents.items():
+            # print("\nBefore to_frame: Agent:", n, a.pose, a.velocity)
+            a = a.to_frame(ObjectFrameEnum.START, current_pose = a.pose, start_pose_abs = self.start_pose)
+            # print("\nAfter to_frame START: Agent:", n, a.pose, a.velocity)
+            # print('==============', a.pose.frame==ObjectFrameEnum.START)
+            res[n] = a
+            if a.type == AgentEnum.PEDESTRIAN:
+                ped_num += 1
+        if ped_num > 0:
+            print("\nDetected", ped_num, "pedestrians")
+        return res
@@ -32,7 +32,13 @@ class Logfile:
         return self.file is not None and not self.eof 
 
     def log(self, message, fields=None, t : float = None) -> None:
-        """Logs a message to the log file.
+        """Logs a message to the log file.  Arguments are the same as
+        :meth:`format_line`."""
+        self.file.write(self.format_line(message,fields,t))
+        self.file.write('\n')
+
+    def format_line(self, message, fields=None, t : float = None) -> str:
+        """Returns the line that :meth:`log` would write, without the newline.
         
         Arguments:
             message: a dict or instance of a serializable class registered in
@@ -74,10 +80,9 @@ class Logfile:
                 message['time'] = t
                 
         if isinstance(message,dict):
-            self.file.write(serialize_collection(message))
+            return serialize_collection(message)
         else:
-            self.file.write(serialize(message)['data'])
-        self.file.write('\n')
+            return serialize(message)['data']
     
     def read(self,
              duration_to_advance : float = None,
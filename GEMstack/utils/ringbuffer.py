@@ -0,0 +1,82 @@
+class RingBuffer:
+    """A bounded queue for handing items from one thread to another without
+    locking, e.g., from a sensor callback to a component's update().
+
+    Exactly one thread may push and exactly one other thread may pop.  Under
+    the GIL, storing a list slot and an int attribute are each atomic, and the
+    producer only publishes an item (by advancing ``tail``) after storing it,
+    so the consumer never sees a partially written item.  Slots are allocated
+    once, so pushing does not allocate.
+
+    Usage::
+
+        buf = RingBuffer(64)
+        #producer thread
+        buf.push(reading)
+        #consumer thread
+        for reading in buf.pop_all():
+            ... do stuff ...
+
+    Args:
+        capacity (int): the maximum number of unread items.  Rounded up to a
+            power of two.
+    """
+    def __init__(self, capacity : int = 16):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        n = 1
+        while n < capacity:
+            n *= 2
+        self.capacity = n
+        self._mask = n-1
+        self._slots = [None]*n
+        self.head = 0      #number of items read, only written by the consumer
+        self.tail = 0      #number of items pushed, only written by the producer
+        self.dropped = 0   #number of items rejected by try_push
+
+    def __len__(self):
+        return min(self.tail - self.head, self.capacity)
+
+    def push(self, item):
+        """Adds an item, overwriting the oldest unread item if the buffer is
+        full.  Producer only."""
+        tail = self.tail
+        self._slots[tail & self._mask] = item
+        self.tail = tail + 1
+
+    def try_push(self, item) -> bool:
+        """Adds an item unless the buffer is full.  Returns False if the item
+        was dropped.  Producer only."""
+        tail = self.tail
+        if tail - self.head >= self.capacity:
+            self.dropped += 1
+            return False
+        self._slots[tail & self._mask] = item
+        self.tail = tail + 1
+        return True
+
+    def pop_all(self) -> list:
+        """Removes and returns all unread items, oldest first.  Items that were
+        overwritten by :meth:`push` before being read are skipped.  Consumer
+        only."""
+        tail = self.tail
+        head = max(self.head, tail - self.capacity)
+        slots = self._slots
+        mask = self._mask
+        items = [slots[i & mask] for i in range(head, tail)]
+        #the producer may have overwritten the oldest slots while we were reading
+        overwritten = self.tail - self.capacity - head
+        if overwritten > 0:
+            items = items[overwritten:]
+        self.head = tail
+        return items
+
+    def latest(self):
+        """Returns the most recently pushed item, or None if there are no
+        unread items, and marks all items as read.  Consumer only."""
+        tail = self.tail
+        if tail == self.head:
+            return None
+        item = self._slots[(tail - 1) & self._mask]
+        self.head = tail
+        return item
@@ -0,0 +1,57 @@
+#needed to import GEMstack from top level directory
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import threading
+import time
+from GEMstack.onboard.component import Component
+from GEMstack.onboard.execution import execution
+from GEMstack.onboard.execution.execution import ComponentExecutor,ComponentScheduler,ExecutorBase
+
+class FakeVehicle:
+	def __init__(self):
+		self.listeners = []
+	def time(self):
+		return time.time()
+	def add_data_listener(self, listener):
+		self.listeners.append(listener)
+	def new_data(self):
+		for listener in self.listeners:
+			listener()
+
+class Rate(Component):
+	def __init__(self, rate):
+		self._rate = rate
+	def rate(self):
+		return self._rate
+
+def wait_with_data(components, data_times):
+	"""Returns how long _wait_for_next_update sleeps for a loop that started
+	now, with sensor data arriving after each of data_times."""
+	vehicle = FakeVehicle()
+	executor = ExecutorBase(vehicle)
+	t = vehicle.time()
+	for c in components:
+		if c.dt != 0:
+			c._next_update_ns = round((t + c.dt)*1e9)
+	scheduler = ComponentScheduler(components)
+	timers = [threading.Timer(dt,vehicle.new_data) for dt in data_times]
+	for timer in timers:
+		timer.start()
+	executor._wait_for_next_update(scheduler,t,0.1)
+	for timer in timers:
+		timer.cancel()
+	return time.time() - t
+
+def test_wake():
+	#new data ends the sleep early for a component with no rate limit
+	assert wait_with_data([ComponentExecutor(Rate(10.0)),ComponentExecutor(Rate(None))],[0.02]) < 0.07
+	#a burst of data is merged into one wake
+	delay = wait_with_data([ComponentExecutor(Rate(10.0)),ComponentExecutor(Rate(None))],[0.0,0.001,0.002])
+	assert execution.MIN_WAKE_INTERVAL*0.9 <= delay < 0.07
+	#new data doesn't wake the loop if nothing more would run
+	assert wait_with_data([ComponentExecutor(Rate(10.0))],[0.02]) >= 0.09
+
+if __name__=='__main__':
+	test_wake()
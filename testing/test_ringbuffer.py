@@ -0,0 +1,63 @@
+#needed to import GEMstack from top level directory
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import threading
+import time
+from GEMstack.utils.ringbuffer import RingBuffer
+
+def test_push_overwrites():
+	buf = RingBuffer(3)
+	assert buf.capacity == 4
+	for i in range(6):
+		buf.push(i)
+	assert len(buf) == 4
+	assert buf.pop_all() == [2,3,4,5]
+	assert len(buf) == 0
+	assert buf.pop_all() == []
+
+def test_try_push():
+	buf = RingBuffer(4)
+	for i in range(4):
+		assert buf.try_push(i)
+	assert not buf.try_push(4)
+	assert not buf.try_push(5)
+	assert buf.dropped == 2
+	assert buf.pop_all() == [0,1,2,3]
+	assert buf.try_push(6)
+	assert buf.pop_all() == [6]
+
+def test_latest():
+	buf = RingBuffer(4)
+	assert buf.latest() is None
+	for i in range(6):
+		buf.push(i)
+	assert buf.latest() == 5
+	assert buf.latest() is None
+	assert buf.pop_all() == []
+
+def test_threaded_order():
+	N = 10000
+	buf = RingBuffer(64)
+	def producer():
+		i = 0
+		while i < N:
+			if buf.try_push(i):
+				i += 1
+			else:
+				time.sleep(0)
+	thread = threading.Thread(target=producer)
+	thread.start()
+	items = []
+	while len(items) < N:
+		items += buf.pop_all()
+		time.sleep(0)
+	thread.join()
+	assert items == list(range(N))
+
+if __name__=='__main__':
+	test_push_overwrites()
+	test_try_push()
+	test_latest()
+	test_threaded_order()